@@ -136,6 +136,10 @@ def process_order():
             },
             timeout=10
         )
+        if 400 <= update_inventory_response.status_code < 500:
+            # Pass client errors such as an unknown product through instead of reporting a 500
+            logger.warning(f"Inventory update rejected: {update_inventory_response.status_code} {update_inventory_response.text}")
+            return jsonify(update_inventory_response.json()), update_inventory_response.status_code
         update_inventory_response.raise_for_status()
         logger.info("Inventory updated successfully")
     except requests.exceptions.RequestException as e:
@@ -146,6 +150,14 @@ def process_order():
     logger.info("Order processed successfully")
     return jsonify({'message': 'Order processed successfully', 'product_id': product_id}), 200
 
+@app.route('/health')
+def health_check():
+    return jsonify({'status': 'healthy'}), 200
+
+@app.route('/ready')
+def readiness_check():
+    return jsonify({'status': 'ready'}), 200
+
 if __name__ == '__main__':
     logger.info("Starting backend server")
     app.run(host='0.0.0.0', port=5002)
@@ -0,0 +1,38 @@
+#!/bin/bash
+
+# Benchmark GET / requests per second with Apache Bench (apt-get install apache2-utils).
+# Run once with INDEX_CACHE=false on the frontends (before) and once with the default
+# INDEX_CACHE=true (after) to compare.
+#
+# Usage: ./benchmark_index.sh [requests] [concurrency]
+
+REQUESTS=${1:-2000}
+CONCURRENCY=${2:-20}
+
+ENDPOINTS=(
+    "http://localhost:5001/"
+    "http://localhost:5005/"
+    "http://localhost/"
+)
+
+# Run ab and print only the requests per second line
+benchmark() {
+    local label=$1
+    shift
+    rps=$(ab -q -n ${REQUESTS} -c ${CONCURRENCY} "$@" 2>/dev/null | grep "Requests per second" | awk '{print $4}')
+    printf "  %-20s %s req/s\n" "${label}" "${rps:-failed}"
+}
+
+for endpoint in "${ENDPOINTS[@]}"; do
+    echo -e "\nBenchmarking GET ${endpoint}"
+    etag=$(curl -s -o /dev/null -D - ${endpoint} | grep -i '^etag:' | cut -d' ' -f2 | tr -d '\r')
+
+    benchmark "full response" ${endpoint}
+    if [ -n "$etag" ]; then
+        benchmark "conditional (304)" -H "If-None-Match: ${etag}" ${endpoint}
+    else
+        echo "  no ETag returned, skipping conditional benchmark"
+    fi
+done
+
+echo -e "\nBenchmark completed."
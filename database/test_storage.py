@@ -0,0 +1,93 @@
+# database/test_storage.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from storage import MemoryStore, ProductStockShard, SQLAlchemyStore, SQLiteStore
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        store = MemoryStore()
+    else:
+        store = SQLiteStore(f"sqlite:///{tmp_path / 'inventory.db'}")
+    store.init_schema()
+    store.seed()
+    return store
+
+
+@pytest.fixture
+def sharded_store(tmp_path):
+    # SQLiteStore ignores shards, so drive the shard logic through SQLAlchemyStore
+    store = SQLAlchemyStore(f"sqlite:///{tmp_path / 'sharded.db'}", shards=4)
+    store.init_schema()
+    store.seed()
+    return store
+
+
+def shard_quantities(store, product_id):
+    session = store.Session()
+    try:
+        shards = session.query(ProductStockShard).filter_by(product_id=product_id) \
+            .order_by(ProductStockShard.shard).all()
+        return [s.quantity for s in shards]
+    finally:
+        session.close()
+
+
+def test_seed_and_get(store):
+    store.seed()
+    assert store.get_product(1) == {'product_id': 1, 'name': 'Product A', 'quantity': 100, 'price': 19.99}
+    product_id = store.add_product('Product D', 5, 9.99)
+    assert store.get_product(product_id)['quantity'] == 5
+
+
+def test_unknown_product(store):
+    assert store.get_product(99) is None
+    assert store.update_inventory(99, 1) is None
+
+
+def test_concurrent_decrement_loses_no_updates(store):
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(lambda _: store.update_inventory(2, 1), range(160)))
+    assert store.get_product(2)['quantity'] == 150 - 160
+
+
+def test_shard_split_on_first_order(sharded_store):
+    new_quantity, shards = sharded_store.update_inventory(1, 1)
+    assert new_quantity == 99
+    assert len(shards) == 1
+    assert sorted(shard_quantities(sharded_store, 1)) == [24, 25, 25, 25]
+
+
+def test_shard_fallback_and_drain(sharded_store):
+    sharded_store.update_inventory(1, 20)
+    # No shard holds 30 any more, so the order drains several shards
+    new_quantity, shards = sharded_store.update_inventory(1, 30)
+    assert new_quantity == 50
+    assert len(shards) > 1
+    assert sum(shard_quantities(sharded_store, 1)) == 50
+    assert sharded_store.get_product(1)['quantity'] == 50
+
+
+def test_shards_go_negative_when_out_of_stock(sharded_store):
+    new_quantity, shards = sharded_store.update_inventory(1, 120)
+    assert new_quantity == -20
+    assert len(shards) == 1
+    assert sharded_store.get_product(1)['quantity'] == -20
+
+
+def test_concurrent_sharded_decrement_loses_no_updates(sharded_store):
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(lambda _: sharded_store.update_inventory(3, 1), range(80)))
+    assert sharded_store.get_product(3)['quantity'] == 200 - 80
+
+
+def test_fold_back_when_sharding_is_turned_off(sharded_store):
+    sharded_store.update_inventory(1, 10)
+    sharded_store.shards = 1
+    assert sharded_store.update_inventory(1, 1) == (89, None)
+    assert shard_quantities(sharded_store, 1) == []
+    assert sharded_store.get_product(1)['quantity'] == 89
@@ -1,10 +1,11 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, make_response
 import requests
 import os
+import hashlib
+from datetime import datetime, timezone
 import logging
 from elasticapm.contrib.flask import ElasticAPM
 import elasticapm
-from elasticapm import Client as ElasticAPMClient
 
 app = Flask(__name__)
 
@@ -21,13 +22,37 @@ app.config['ELASTIC_APM'] = {
     'CAPTURE_BODY': 'all'
 }
 apm = ElasticAPM(app)
-elastic_apm_client = ElasticAPMClient(app.config['ELASTIC_APM'])
 
 BACKEND_SERVICE_URL = os.getenv('BACKEND_SERVICE_URL', 'http://backend:5002')
 
+# Cache the rendered index page and let browsers/nginx revalidate it with ETag/Last-Modified
+INDEX_CACHE = os.getenv('INDEX_CACHE', 'true').lower() == 'true'
+INDEX_MAX_AGE = int(os.getenv('INDEX_MAX_AGE', '60'))
+_index_cache = None
+
+def cached_index():
+    global _index_cache
+    if _index_cache is None:
+        body = render_template('index.html').encode('utf-8')
+        template_path = os.path.join(app.root_path, app.template_folder, 'index.html')
+        last_modified = datetime.fromtimestamp(int(os.path.getmtime(template_path)), tz=timezone.utc)
+        _index_cache = (body, hashlib.md5(body).hexdigest(), last_modified)
+    return _index_cache
+
+def index_response():
+    if not INDEX_CACHE:
+        return render_template('index.html')
+    body, etag, last_modified = cached_index()
+    response = make_response(body)
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = INDEX_MAX_AGE
+    return response.make_conditional(request)
+
 @app.route('/')
 def index():
-    return render_template('index.html')
+    return index_response()
 
 @app.route('/order', methods=['POST'])
 def place_order():
@@ -92,12 +117,16 @@ def place_order():
     except requests.exceptions.RequestException as e:
         app.logger.error(f"Error communicating with backend: {str(e)}")
         logging.error(f"Error processing order: {str(e)}")
-        elastic_apm_client.capture_exception()
+        apm.client.capture_exception()
         return jsonify({'message': 'Error processing order'}), 500
 
 @app.route('/health')
 def health_check():
     return jsonify({'status': 'healthy'}), 200
 
+@app.route('/ready')
+def readiness_check():
+    return jsonify({'status': 'ready'}), 200
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5001)
@@ -1,22 +1,18 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, make_response
 import requests
 import logging
+import os
 import time
 import random
+import hashlib
+import threading
+from datetime import datetime, timezone
 from opentelemetry import trace, metrics
 from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 from opentelemetry.instrumentation.flask import FlaskInstrumentor
 from opentelemetry.instrumentation.requests import RequestsInstrumentor
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.semconv.resource import ResourceAttributes
-from opentelemetry.sdk.metrics import MeterProvider
-from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
-from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
-from opentelemetry.sdk._logs import LoggerProvider
-from opentelemetry.sdk._logs.export import BatchLogRecordProcessor
-from opentelemetry.exporter.otlp.proto.grpc._log_exporter import OTLPLogExporter
 
 # Set up basic logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -33,18 +29,54 @@ resource = Resource(attributes={
 
 # Trace configuration
 trace.set_tracer_provider(TracerProvider(resource=resource))
-otlp_span_exporter = OTLPSpanExporter()
-span_processor = BatchSpanProcessor(otlp_span_exporter)
-trace.get_tracer_provider().add_span_processor(span_processor)
 
-# Metrics configuration
-metric_reader = PeriodicExportingMetricReader(OTLPMetricExporter())
-metrics.set_meter_provider(MeterProvider(resource=resource, metric_readers=[metric_reader]))
+# The OTLP gRPC exporters are created in a background thread so the process starts
+# without waiting for them. Meters handed out before then are proxies that switch to
+# the real provider once init_telemetry() has run. Spans ended before that are not
+# exported, so /ready returns 503 until telemetry_ready is set.
+telemetry_started = False
+telemetry_ready = threading.Event()
+telemetry_lock = threading.Lock()
+logger_provider = None
 
-# Logs configuration
-otlp_log_exporter = OTLPLogExporter()
-logger_provider = LoggerProvider(resource=resource)
-logger_provider.add_log_record_processor(BatchLogRecordProcessor(otlp_log_exporter))
+def init_telemetry():
+    global logger_provider
+    try:
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.metrics import MeterProvider
+        from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+        from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
+        from opentelemetry.sdk._logs import LoggerProvider
+        from opentelemetry.sdk._logs.export import BatchLogRecordProcessor
+        from opentelemetry.exporter.otlp.proto.grpc._log_exporter import OTLPLogExporter
+
+        # Trace export
+        span_processor = BatchSpanProcessor(OTLPSpanExporter())
+        trace.get_tracer_provider().add_span_processor(span_processor)
+
+        # Metrics configuration
+        metric_reader = PeriodicExportingMetricReader(OTLPMetricExporter())
+        metrics.set_meter_provider(MeterProvider(resource=resource, metric_readers=[metric_reader]))
+
+        # Logs configuration
+        logger_provider = LoggerProvider(resource=resource)
+        logger_provider.add_log_record_processor(BatchLogRecordProcessor(OTLPLogExporter()))
+
+        logger.info("OpenTelemetry exporters initialized")
+    except Exception:
+        logger.exception("Failed to initialize OpenTelemetry exporters")
+    finally:
+        # Serve traffic even if the exporters could not be created
+        telemetry_ready.set()
+
+def start_telemetry():
+    global telemetry_started
+    with telemetry_lock:
+        if telemetry_started:
+            return
+        telemetry_started = True
+    threading.Thread(target=init_telemetry, daemon=True).start()
 
 # Instrument Flask
 FlaskInstrumentor().instrument_app(app)
@@ -82,11 +114,41 @@ active_users = meter.create_up_down_counter(
 
 BACKEND_SERVICE_URL = "http://backend:5002"
 
+# Cache the rendered index page and let browsers/nginx revalidate it with ETag/Last-Modified
+INDEX_CACHE = os.getenv('INDEX_CACHE', 'true').lower() == 'true'
+INDEX_MAX_AGE = int(os.getenv('INDEX_MAX_AGE', '60'))
+_index_cache = None
+
+def cached_index():
+    global _index_cache
+    if _index_cache is None:
+        body = render_template('index.html').encode('utf-8')
+        template_path = os.path.join(app.root_path, app.template_folder, 'index.html')
+        last_modified = datetime.fromtimestamp(int(os.path.getmtime(template_path)), tz=timezone.utc)
+        _index_cache = (body, hashlib.md5(body).hexdigest(), last_modified)
+    return _index_cache
+
+def index_response():
+    if not INDEX_CACHE:
+        return render_template('index.html')
+    body, etag, last_modified = cached_index()
+    response = make_response(body)
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = INDEX_MAX_AGE
+    return response.make_conditional(request)
+
+@app.before_request
+def ensure_telemetry():
+    if not telemetry_started:
+        start_telemetry()
+
 @app.route('/')
 def index():
     logger.info("Accessed home page")
     active_users.add(1)
-    return render_template('index.html')
+    return index_response()
 
 @app.route('/order', methods=['POST'])
 def place_order():
@@ -171,6 +233,12 @@ def health_check():
     logger.info("Health check requested")
     return jsonify({'status': 'healthy'}), 200
 
+@app.route('/ready')
+def readiness_check():
+    if not telemetry_ready.is_set():
+        return jsonify({'status': 'not ready'}), 503
+    return jsonify({'status': 'ready'}), 200
+
 @app.route('/simulate_error')
 def simulate_error():
     logger.error("Simulated error occurred")
@@ -192,4 +260,5 @@ def handle_exception(e):
 
 if __name__ == '__main__':
     logger.info("Starting Flask application on port 5005")
+    start_telemetry()
     app.run(host='0.0.0.0', port=5005)
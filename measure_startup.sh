@@ -0,0 +1,47 @@
+#!/bin/bash
+
+# Measure the cold-start time of each service: the time from restarting its
+# container until its /ready endpoint returns 200.
+#
+# Usage: ./measure_startup.sh [service ...]
+
+TIMEOUT=${TIMEOUT:-60}
+
+declare -A READY_URLS=(
+    [frontend-flask]="http://localhost:5001/ready"
+    [frontend-otel]="http://localhost:5005/ready"
+    [backend]="http://localhost:5002/ready"
+    [database]="http://localhost:5003/ready"
+)
+
+SERVICES=("$@")
+if [ ${#SERVICES[@]} -eq 0 ]; then
+    SERVICES=(database backend frontend-flask frontend-otel)
+fi
+
+for service in "${SERVICES[@]}"; do
+    url=${READY_URLS[$service]}
+    if [ -z "$url" ]; then
+        echo "Unknown service: ${service}"
+        continue
+    fi
+
+    docker-compose stop ${service} > /dev/null 2>&1
+    start=$(date +%s.%N)
+    docker-compose start ${service} > /dev/null 2>&1
+
+    ready=""
+    while [ $(echo "$(date +%s.%N) - ${start} < ${TIMEOUT}" | bc) -eq 1 ]; do
+        if [ "$(curl -s -o /dev/null -w '%{http_code}' ${url})" = "200" ]; then
+            ready=$(echo "$(date +%s.%N) - ${start}" | bc)
+            break
+        fi
+        sleep 0.1
+    done
+
+    if [ -n "$ready" ]; then
+        printf "%-16s ready in %.2fs\n" "${service}" "${ready}"
+    else
+        printf "%-16s not ready after %ss\n" "${service}" "${TIMEOUT}"
+    fi
+done
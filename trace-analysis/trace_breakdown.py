@@ -0,0 +1,298 @@
+# trace-analysis/trace_breakdown.py
+
+import argparse
+import html
+import json
+import math
+import sys
+from collections import defaultdict, namedtuple
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+Span = namedtuple('Span', 'trace_id span_id parent_id name kind service peer start end')
+
+PERCENTILES = (50, 95, 99)
+
+# Hops in the order a request crosses them; anything else is reported after these
+HOP_ORDER = ['frontend', 'http_transfer', 'backend', 'database', 'db_query']
+
+# Service name prefixes and the hop their self time is attributed to
+DEFAULT_SERVICE_HOPS = [
+    ('frontend', 'frontend'),
+    ('backend', 'backend'),
+    ('database', 'database'),
+]
+
+DB_SPAN_NAMES = {'database_operation'}
+
+
+def _otlp_attributes(attributes):
+    values = {}
+    for attribute in attributes or []:
+        value = attribute.get('value', {})
+        values[attribute['key']] = next(iter(value.values()), None) if value else None
+    return values
+
+
+def _otlp_kind(kind):
+    # OTLP JSON encodes the kind either as an enum name or as its number
+    names = {1: 'INTERNAL', 2: 'SERVER', 3: 'CLIENT', 4: 'PRODUCER', 5: 'CONSUMER'}
+    if isinstance(kind, int):
+        return names.get(kind, 'INTERNAL')
+    return str(kind or 'INTERNAL').replace('SPAN_KIND_', '')
+
+
+def _peer(attributes):
+    url = attributes.get('http.url') or attributes.get('url.full')
+    if url:
+        return urlparse(url).hostname
+    return attributes.get('net.peer.name') or attributes.get('server.address')
+
+
+def parse_otlp(document):
+    """Parse an OTLP JSON ExportTraceServiceRequest into Spans."""
+    spans = []
+    for resource_spans in document.get('resourceSpans', []):
+        resource = _otlp_attributes(resource_spans.get('resource', {}).get('attributes'))
+        service = resource.get('service.name', 'unknown')
+        scopes = resource_spans.get('scopeSpans') or resource_spans.get('instrumentationLibrarySpans', [])
+        for scope in scopes:
+            for span in scope.get('spans', []):
+                attributes = _otlp_attributes(span.get('attributes'))
+                spans.append(Span(
+                    trace_id=span['traceId'],
+                    span_id=span['spanId'],
+                    parent_id=span.get('parentSpanId') or None,
+                    name=span.get('name', ''),
+                    kind=_otlp_kind(span.get('kind')),
+                    service=service,
+                    peer=_peer(attributes),
+                    start=int(span['startTimeUnixNano']),
+                    end=int(span['endTimeUnixNano']),
+                ))
+    return spans
+
+
+def _iso_to_ns(value):
+    parsed = datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%fZ').replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp()) * 1_000_000_000 + parsed.microsecond * 1000
+
+
+def parse_span_dump(items):
+    """Parse a list of ReadableSpan.to_json() objects, e.g. from InMemorySpanExporter."""
+    spans = []
+    for item in items:
+        if isinstance(item, str):
+            item = json.loads(item)
+        resource = item.get('resource', {})
+        attributes = item.get('attributes', {})
+        spans.append(Span(
+            trace_id=item['context']['trace_id'],
+            span_id=item['context']['span_id'],
+            parent_id=item.get('parent_id') or None,
+            name=item.get('name', ''),
+            kind=str(item.get('kind', 'SpanKind.INTERNAL')).replace('SpanKind.', ''),
+            service=resource.get('attributes', {}).get('service.name', 'unknown'),
+            peer=_peer(attributes),
+            start=_iso_to_ns(item['start_time']),
+            end=_iso_to_ns(item['end_time']),
+        ))
+    return spans
+
+
+def load_spans(path):
+    """Load spans from an OTLP JSON file, OTLP JSON lines or an in-memory exporter dump."""
+    with open(path) as f:
+        content = f.read()
+    try:
+        documents = [json.loads(content)]
+    except json.JSONDecodeError:
+        # The collector file exporter writes one export request per line
+        documents = [json.loads(line) for line in content.splitlines() if line.strip()]
+
+    spans = []
+    for document in documents:
+        if isinstance(document, list):
+            spans.extend(parse_span_dump(document))
+        else:
+            spans.extend(parse_otlp(document))
+    return spans
+
+
+def hop_for_service(service, service_hops):
+    for prefix, hop in service_hops:
+        if service and service.startswith(prefix):
+            return hop
+    return service or 'other'
+
+
+def _covered(intervals, start, end):
+    # Total time within [start, end] covered by the union of the intervals
+    covered = 0
+    cursor = start
+    for child_start, child_end in sorted(intervals):
+        child_start, child_end = max(child_start, cursor), min(child_end, end)
+        if child_end > child_start:
+            covered += child_end - child_start
+            cursor = child_end
+    return covered
+
+
+def trace_breakdown(spans, service_hops):
+    """Return the end-to-end duration and the time spent per hop for one trace, in ms."""
+    children = defaultdict(list)
+    for span in spans:
+        children[span.parent_id].append(span)
+
+    hops = defaultdict(float)
+    for span in spans:
+        self_ns = (span.end - span.start) - _covered(
+            [(child.start, child.end) for child in children[span.span_id]], span.start, span.end)
+        if span.name in DB_SPAN_NAMES:
+            hop = 'db_query'
+        elif span.kind == 'CLIENT' and children[span.span_id]:
+            # Client time not covered by the downstream server span is transfer time
+            hop = 'http_transfer'
+        elif span.kind == 'CLIENT' and span.peer:
+            # The downstream service is not in the export, charge the call to it
+            hop = hop_for_service(span.peer, service_hops)
+        else:
+            hop = hop_for_service(span.service, service_hops)
+        hops[hop] += max(self_ns, 0) / 1e6
+
+    total = (max(span.end for span in spans) - min(span.start for span in spans)) / 1e6
+    return total, hops
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(int(math.ceil(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[rank]
+
+
+def analyze(spans, service_hops=DEFAULT_SERVICE_HOPS, span_name=None):
+    """Compute each hop's pXX and its share of the end-to-end pXX across traces.
+
+    When span_name is given, only traces containing a span with that name are used.
+    """
+    traces = defaultdict(list)
+    for span in spans:
+        traces[span.trace_id].append(span)
+
+    totals = []
+    hop_values = defaultdict(list)
+    breakdowns = []
+    for trace_spans in traces.values():
+        if span_name and not any(span.name == span_name for span in trace_spans):
+            continue
+        breakdowns.append(trace_breakdown(trace_spans, service_hops))
+
+    hop_names = sorted({hop for _, hops in breakdowns for hop in hops},
+                       key=lambda hop: (HOP_ORDER.index(hop) if hop in HOP_ORDER else len(HOP_ORDER), hop))
+    for total, hops in breakdowns:
+        totals.append(total)
+        for hop in hop_names:
+            hop_values[hop].append(hops.get(hop, 0.0))
+
+    report = {
+        'traces': len(breakdowns),
+        'total': {pct: percentile(totals, pct) for pct in PERCENTILES},
+        'hops': [],
+    }
+    for hop in hop_names:
+        row = {'hop': hop}
+        for pct in PERCENTILES:
+            value = percentile(hop_values[hop], pct)
+            row[pct] = value
+            row[f'share_{pct}'] = value / report['total'][pct] * 100 if report['total'][pct] else 0.0
+        report['hops'].append(row)
+    return report
+
+
+def format_table(report):
+    header = f"{'hop':<16}" + ''.join(f"{f'p{pct} ms':>12}{'share':>8}" for pct in PERCENTILES)
+    lines = [f"Traces analysed: {report['traces']}", header, '-' * len(header)]
+    for row in report['hops']:
+        lines.append(f"{row['hop']:<16}" + ''.join(
+            f"{row[pct]:>12.1f}{row[f'share_{pct}']:>7.1f}%" for pct in PERCENTILES))
+    lines.append('-' * len(header))
+    lines.append(f"{'end-to-end':<16}" + ''.join(
+        f"{report['total'][pct]:>12.1f}{'':>8}" for pct in PERCENTILES))
+    return '\n'.join(lines)
+
+
+def format_html(report):
+    rows = []
+    for row in report['hops']:
+        cells = ''.join(
+            f"<td>{row[pct]:.1f}</td><td><div class=\"bar\" style=\"width:{min(row[f'share_{pct}'], 100):.0f}%\"></div>"
+            f"{row[f'share_{pct}']:.1f}%</td>" for pct in PERCENTILES)
+        rows.append(f"<tr><th>{html.escape(row['hop'])}</th>{cells}</tr>")
+    totals = ''.join(f"<td>{report['total'][pct]:.1f}</td><td></td>" for pct in PERCENTILES)
+    headers = ''.join(f"<th>p{pct} ms</th><th>share</th>" for pct in PERCENTILES)
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Critical path latency breakdown</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; }}
+th, td {{ padding: 4px 12px; border-bottom: 1px solid #ddd; text-align: right; }}
+.bar {{ display: inline-block; height: 10px; max-width: 100px; background: #3b82f6; margin-right: 6px; }}
+</style>
+</head>
+<body>
+<h1>Critical path latency breakdown</h1>
+<p>Traces analysed: {report['traces']}</p>
+<table>
+<tr><th>hop</th>{headers}</tr>
+{''.join(rows)}
+<tr><th>end-to-end</th>{totals}</tr>
+</table>
+</body>
+</html>
+"""
+
+
+def service_hop(value):
+    service, sep, hop = value.partition('=')
+    if not sep or not service or not hop:
+        raise argparse.ArgumentTypeError(f"expected SERVICE=HOP, got {value!r}")
+    return service, hop
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Per-hop latency breakdown of exported traces')
+    parser.add_argument('files', nargs='+', help='OTLP JSON files or in-memory exporter dumps')
+    parser.add_argument('--html', help='Write an HTML report to this path')
+    parser.add_argument('--span-name', help='Only analyse traces containing this span, e.g. place_order')
+    parser.add_argument('--hop', action='append', default=[], metavar='SERVICE=HOP', type=service_hop,
+                        help='Attribute spans of services starting with SERVICE to HOP')
+    args = parser.parse_args(argv)
+
+    service_hops = args.hop + DEFAULT_SERVICE_HOPS
+
+    spans = []
+    for path in args.files:
+        spans.extend(load_spans(path))
+    if not spans:
+        print('No spans found', file=sys.stderr)
+        return 1
+
+    report = analyze(spans, service_hops, args.span_name)
+    if not report['traces']:
+        print(f"No traces contain span {args.span_name}", file=sys.stderr)
+        return 1
+    print(format_table(report))
+    if args.html:
+        with open(args.html, 'w') as f:
+            f.write(format_html(report))
+        print(f"HTML report written to {args.html}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())